@@ -0,0 +1,352 @@
+import argparse
+import csv
+import itertools
+import logging
+import os
+import time
+
+CYCLE_FILE = "No_of_cycles.txt"
+
+# Defaults match the GUI's control parameters
+DEFAULT_PARAMS = {
+    "target_rpm": 320,
+    "forward_torque": 100,
+    "reverse_torque": -100,
+    "forward_duration": 5,
+    "reverse_duration": 3,
+    "max_motor_current": 100,
+    "max_brake_current": 100,
+    "auto_stop_on_wear": True,
+}
+
+MATRIX_COLUMNS = set(DEFAULT_PARAMS) | {"case_id", "cycles"}
+
+CHANNELS = ("forward_rpm", "reverse_rpm", "motor_temp")
+
+REPORT_COLUMNS = (
+    ["case_id"] + list(DEFAULT_PARAMS) +
+    ["cycles", "status", "start_cycle", "end_cycle", "cycles_completed", "duration_s", "cycles_per_hour"] +
+    [f"{channel}_{stat}" for channel in CHANNELS for stat in ("mean", "std", "min", "max")] +
+    ["anomaly_level", "anomaly_message", "first_slip_cycle", "wear_detected"]
+)
+
+
+def _parse_value(value):
+    value = value.strip()
+    if value.lower() in ("true", "yes"):
+        return True
+    if value.lower() in ("false", "no"):
+        return False
+    return float(value)
+
+
+def _read_csv_rows(file_name):
+    with open(file_name, "r", newline="") as file:
+        return [row for row in csv.reader(file)]
+
+
+def _ods_cell_text(cell, teletype):
+    # Prefer the stored value so locale formatting ("1,000", "2,5") doesn't matter
+    value_type = cell.getAttribute("valuetype")
+    if value_type in ("float", "percentage", "currency"):
+        value = float(cell.getAttribute("value"))
+        return str(int(value)) if value.is_integer() else repr(value)
+    if value_type == "boolean":
+        return cell.getAttribute("booleanvalue")
+    return teletype.extractText(cell)
+
+
+def _read_ods_rows(file_name):
+    try:
+        from odf.opendocument import load
+        from odf.table import Table, TableRow, TableCell
+        from odf import teletype
+    except ImportError:
+        raise ImportError("odfpy is required to read .ods test matrices (pip install odfpy)")
+
+    sheet = load(file_name).spreadsheet.getElementsByType(Table)[0]
+    rows = []
+    for table_row in sheet.getElementsByType(TableRow):
+        cells = table_row.getElementsByType(TableCell)
+        row = []
+        for index, cell in enumerate(cells):
+            text = _ods_cell_text(cell, teletype)
+            repeat = int(cell.getAttribute("numbercolumnsrepeated") or 1)
+            # Trailing blank runs pad the row out to the sheet width (~1024 columns)
+            if not text.strip() and index == len(cells) - 1:
+                repeat = 1
+            row.extend([text] * repeat)
+        repeat = int(table_row.getAttribute("numberrowsrepeated") or 1)
+        # Blank rows are dropped later; don't expand the ~1M-row trailing run
+        if not any(cell.strip() for cell in row):
+            repeat = 1
+        rows.extend([row] * repeat)
+    return rows
+
+
+def load_test_matrix(file_name, defaults=None):
+    """
+    Loads test cases from a CSV or ODS matrix.
+
+    The first row holds column names (see DEFAULT_PARAMS plus `case_id` and
+    `cycles`); unknown columns are rejected. Missing parameter columns fall
+    back to `defaults`, then to DEFAULT_PARAMS. A cell may list several
+    values separated by ';', in which case the row expands to every
+    combination.
+    """
+    if file_name.lower().endswith(".ods"):
+        rows = _read_ods_rows(file_name)
+    else:
+        rows = _read_csv_rows(file_name)
+
+    rows = [row for row in rows if any(cell.strip() for cell in row)]
+    if not rows:
+        raise ValueError(f"Test matrix {file_name} is empty")
+    header = [cell.strip().lower().replace(" ", "_") for cell in rows[0]]
+    unknown = [column for column in header if column and column not in MATRIX_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown column(s) in test matrix: {', '.join(unknown)}")
+    if "cycles" not in header:
+        raise ValueError("Test matrix must have a 'cycles' column")
+
+    case_defaults = dict(DEFAULT_PARAMS)
+    case_defaults.update(defaults or {})
+
+    cases = []
+    for row_number, row in enumerate(rows[1:], start=2):
+        cells = dict(zip(header, row))
+        base_id = cells.pop("case_id", "").strip() or f"case_{row_number - 1}"
+
+        options = {}
+        for column, cell in cells.items():
+            if not column or not cell.strip():
+                continue
+            try:
+                options[column] = [_parse_value(value) for value in cell.split(";") if value.strip()]
+            except ValueError:
+                raise ValueError(f"Invalid value '{cell}' in column '{column}' on row {row_number}")
+
+        columns = list(options)
+        combinations = list(itertools.product(*(options[column] for column in columns)))
+        for index, combination in enumerate(combinations, start=1):
+            case = dict(case_defaults)
+            case.update(zip(columns, combination))
+            case["case_id"] = base_id if len(combinations) == 1 else f"{base_id}.{index}"
+            case["cycles"] = int(case["cycles"])
+            if case["cycles"] <= 0:
+                raise ValueError(f"Case {case['case_id']} needs a positive cycle count")
+            cases.append(case)
+    return cases
+
+
+class BatchRunner:
+    """Runs a list of test cases back-to-back on one MotorController session."""
+
+    def __init__(self, motor_controller, cycle_file=CYCLE_FILE, stop_on_wear=True):
+        self.motor_controller = motor_controller
+        self.cycle_file = cycle_file
+        self.stop_on_wear = stop_on_wear
+        self.stop_requested = False
+        self.interrupted = False
+        self.results = []
+        self.current_case = None
+
+    def stop(self):
+        """Stops the running case and skips the rest of the batch."""
+        self.stop_requested = True
+        self.motor_controller.stop_test()
+
+    def run_case(self, case):
+        """Configures the controller for one case and runs its cycles."""
+        start_cycle = self.motor_controller.get_last_cycle_count(self.cycle_file) + 1
+        start_time = time.time()
+        status = "error"
+        next_cycle = None
+        interrupted = False
+        try:
+            torque_duration_pairs = self.motor_controller.configure_test(case)
+            next_cycle = self.motor_controller.perform_motor_cycles(
+                torque_duration_pairs, case["cycles"], self.cycle_file)
+            if self.motor_controller.wear_stop:
+                status = "wear_stop"
+            elif next_cycle - start_cycle >= case["cycles"]:
+                status = "completed"
+            elif self.stop_requested:
+                status = "stopped"
+            else:
+                status = "incomplete"
+        except KeyboardInterrupt:
+            logging.warning(f"Case {case['case_id']} interrupted")
+            status = "stopped"
+            interrupted = True
+        except Exception as e:
+            logging.error(f"Error running case {case['case_id']}: {e}")
+
+        if next_cycle is None:
+            # perform_motor_cycles didn't return; count what it logged before failing
+            next_cycle = max(self.motor_controller.get_last_cycle_count(self.cycle_file) + 1, start_cycle)
+        duration = time.time() - start_time
+        cycles_completed = next_cycle - start_cycle
+        detector = self.motor_controller.anomaly_detector
+        result = {column: case.get(column) for column in ["case_id"] + list(DEFAULT_PARAMS) + ["cycles"]}
+        result.update({
+            "status": status,
+            "start_cycle": start_cycle if cycles_completed else None,
+            "end_cycle": next_cycle - 1 if cycles_completed else None,
+            "cycles_completed": cycles_completed,
+            "duration_s": round(duration, 1),
+            "cycles_per_hour": round(cycles_completed * 3600 / duration, 1) if duration > 0 else None,
+            "anomaly_level": detector.worst_level,
+            "anomaly_message": detector.worst_message,
+            "first_slip_cycle": detector.first_slip_cycle,
+            "wear_detected": detector.wear_seen,
+        })
+        for channel, stats in detector.summary().items():
+            for stat in ("mean", "std", "min", "max"):
+                result[f"{channel}_{stat}"] = stats[stat]
+        logging.info(f"Case {case['case_id']} finished: {status}, {cycles_completed} cycles")
+        if interrupted:
+            self.stop_requested = True
+            self.interrupted = True
+        return result
+
+    def run(self, cases):
+        """
+        Runs every case in order and returns the per-case results.
+
+        On Ctrl-C the interrupted case and the skipped remainder are still
+        recorded in `results` before the KeyboardInterrupt is re-raised.
+        """
+        self.stop_requested = False
+        self.interrupted = False
+        self.results = []
+        for case in cases:
+            if self.stop_requested:
+                self.results.append(self._skipped(case, "stopped"))
+                continue
+            self.current_case = case
+            result = self.run_case(case)
+            self.results.append(result)
+            if result.get("wear_detected") and self.stop_on_wear:
+                logging.warning(f"Batch aborted after clutch wear in case {case['case_id']}")
+                self.stop_requested = True
+        self.current_case = None
+        if self.interrupted:
+            raise KeyboardInterrupt
+        return self.results
+
+    def _skipped(self, case, reason):
+        result = {column: case.get(column) for column in ["case_id"] + list(DEFAULT_PARAMS) + ["cycles"]}
+        result.update({"status": f"skipped ({reason})", "cycles_completed": 0})
+        return result
+
+
+def summarize_results(results):
+    """Builds campaign-level summary statistics from per-case results."""
+    completed = [r for r in results if r["status"] == "completed"]
+    ran = [r for r in results if r.get("duration_s") is not None]
+    total_cycles = sum(r["cycles_completed"] for r in results)
+    total_duration = sum(r["duration_s"] for r in ran)
+    summary = {
+        "cases_total": len(results),
+        "cases_completed": len(completed),
+        "cases_failed": len(ran) - len(completed),
+        "cases_skipped": len(results) - len(ran),
+        "total_cycles": total_cycles,
+        "total_duration_s": round(total_duration, 1),
+        "cycles_per_hour": round(total_cycles * 3600 / total_duration, 1) if total_duration > 0 else None,
+        "wear_detected": any(r.get("wear_detected") for r in results),
+    }
+    for channel in CHANNELS:
+        means = [r[f"{channel}_mean"] for r in ran if r.get(f"{channel}_mean") is not None]
+        minimums = [r[f"{channel}_min"] for r in ran if r.get(f"{channel}_min") is not None]
+        maximums = [r[f"{channel}_max"] for r in ran if r.get(f"{channel}_max") is not None]
+        summary[f"{channel}_mean"] = round(sum(means) / len(means), 3) if means else None
+        summary[f"{channel}_min"] = min(minimums) if minimums else None
+        summary[f"{channel}_max"] = max(maximums) if maximums else None
+    return summary
+
+
+def _write_csv_report(file_name, results, summary):
+    with open(file_name, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=REPORT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+    summary_file = f"{os.path.splitext(file_name)[0]}_summary.csv"
+    with open(summary_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["metric", "value"])
+        writer.writerows(summary.items())
+
+
+def _write_ods_report(file_name, results, summary):
+    try:
+        from odf.opendocument import OpenDocumentSpreadsheet
+        from odf.table import Table, TableRow, TableCell
+        from odf.text import P
+    except ImportError:
+        raise ImportError("odfpy is required to write .ods reports (pip install odfpy)")
+
+    def add_row(table, values):
+        row = TableRow()
+        for value in values:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                cell = TableCell(valuetype="float", value=value)
+            else:
+                cell = TableCell(valuetype="string")
+            cell.addElement(P(text="" if value is None else str(value)))
+            row.addElement(cell)
+        table.addElement(row)
+
+    document = OpenDocumentSpreadsheet()
+    results_table = Table(name="Results")
+    add_row(results_table, REPORT_COLUMNS)
+    for result in results:
+        add_row(results_table, [result.get(column) for column in REPORT_COLUMNS])
+    summary_table = Table(name="Summary")
+    add_row(summary_table, ["metric", "value"])
+    for metric, value in summary.items():
+        add_row(summary_table, [metric, value])
+    document.spreadsheet.addElement(results_table)
+    document.spreadsheet.addElement(summary_table)
+    document.save(file_name)
+
+
+def write_report(file_name, results):
+    """Writes the per-case results and summary statistics to a CSV or ODS report."""
+    summary = summarize_results(results)
+    if file_name.lower().endswith(".ods"):
+        _write_ods_report(file_name, results, summary)
+    else:
+        _write_csv_report(file_name, results, summary)
+    logging.info(f"Batch report written to {file_name}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a test-case matrix on the one-way clutch tester.")
+    parser.add_argument("matrix", help="Test matrix file (.csv or .ods)")
+    parser.add_argument("--report", default=None, help="Report file (.csv or .ods)")
+    parser.add_argument("--port", default="COM8", help="Modbus serial port")
+    parser.add_argument("--continue-on-wear", action="store_true",
+                        help="Keep running the remaining cases after clutch wear is detected")
+    args = parser.parse_args()
+
+    from motor_controller import MotorController
+
+    cases = load_test_matrix(args.matrix)
+    report = args.report or time.strftime("Batch_report_%Y%m%d_%H%M%S.csv")
+    runner = BatchRunner(MotorController(port=args.port), stop_on_wear=not args.continue_on_wear)
+    try:
+        runner.run(cases)
+    except KeyboardInterrupt:
+        runner.stop()
+    finally:
+        summary = write_report(report, runner.results)
+    print(f"Report written to {report}")
+    for metric, value in summary.items():
+        print(f"{metric}: {value}")
+
+
+if __name__ == "__main__":
+    main()
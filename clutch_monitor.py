@@ -0,0 +1,264 @@
+import json
+import logging
+import math
+import os
+import time
+
+LEVEL_NORMAL = "normal"
+LEVEL_WARNING = "warning"
+LEVEL_CRITICAL = "critical"
+
+_LEVEL_RANK = {LEVEL_NORMAL: 0, LEVEL_WARNING: 1, LEVEL_CRITICAL: 2}
+
+# Absolute so the GUI and the Flask API agree regardless of working directory
+STATUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Anomaly_status.json")
+
+
+class ChannelMonitor:
+    """
+    Streaming EWMA/CUSUM statistics for a single per-cycle measurement.
+
+    The first `warmup_cycles` samples establish a baseline mean and standard
+    deviation (Welford). After that the baseline is frozen and a one-sided
+    CUSUM accumulates standardised deviations in the direction given by
+    `direction` (-1 watches for a drop, +1 for a rise). All state is a handful
+    of floats, so every update is O(1) in time and memory.
+
+    Channels that drift legitimately during a run (e.g. temperature while the
+    motor warms up) can instead be graded against absolute `warning_limit` and
+    `critical_limit` values, with the CUSUM left out.
+    """
+
+    def __init__(self, name, direction, alpha=0.1, warmup_cycles=50, min_sigma=1.0,
+                 cusum_k=1.0, cusum_warning=6.0, cusum_critical=12.0, warning_limit=None, critical_limit=None):
+        self.name = name
+        self.direction = direction
+        self.alpha = alpha
+        self.warmup_cycles = warmup_cycles
+        self.min_sigma = min_sigma
+        self.cusum_k = cusum_k
+        self.cusum_warning = cusum_warning
+        self.cusum_critical = cusum_critical
+        self.warning_limit = warning_limit
+        self.critical_limit = critical_limit
+        self.reset()
+
+    def reset(self):
+        """Clears the baseline and all running statistics."""
+        self.count = 0
+        self.baseline_mean = 0.0
+        self._baseline_m2 = 0.0
+        self.baseline_sigma = self.min_sigma
+        self.ewma = None
+        self.cusum = 0.0
+        self.last_value = None
+        self.level = LEVEL_NORMAL
+        self.samples = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    @property
+    def warmed_up(self):
+        return self.count >= self.warmup_cycles
+
+    def update(self, value):
+        """Feeds one sample and returns the resulting alarm level."""
+        self.last_value = value
+        self.samples += 1
+        delta = value - self._mean
+        self._mean += delta / self.samples
+        self._m2 += delta * (value - self._mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.ewma = value if self.ewma is None else self.alpha * value + (1 - self.alpha) * self.ewma
+
+        if self.critical_limit is not None or self.warning_limit is not None:
+            self.level = self._limit_level(value)
+            return self.level
+
+        if not self.warmed_up:
+            self.count += 1
+            delta = value - self.baseline_mean
+            self.baseline_mean += delta / self.count
+            self._baseline_m2 += delta * (value - self.baseline_mean)
+            if self.count >= self.warmup_cycles:
+                variance = self._baseline_m2 / (self.count - 1) if self.count > 1 else 0.0
+                self.baseline_sigma = max(math.sqrt(variance), self.min_sigma)
+            self.level = LEVEL_NORMAL
+            return self.level
+
+        self.count += 1
+        z = self.direction * (value - self.baseline_mean) / self.baseline_sigma
+        self.cusum = max(0.0, self.cusum + z - self.cusum_k)
+
+        if self.cusum >= self.cusum_critical:
+            self.level = LEVEL_CRITICAL
+        elif self.cusum >= self.cusum_warning:
+            self.level = LEVEL_WARNING
+        else:
+            self.level = LEVEL_NORMAL
+        return self.level
+
+    def _limit_level(self, value):
+        if self.critical_limit is not None and self.direction * (value - self.critical_limit) >= 0:
+            return LEVEL_CRITICAL
+        if self.warning_limit is not None and self.direction * (value - self.warning_limit) >= 0:
+            return LEVEL_WARNING
+        return LEVEL_NORMAL
+
+    def snapshot(self):
+        return {
+            "last": self.last_value,
+            "ewma": None if self.ewma is None else round(self.ewma, 3),
+            "baseline_mean": round(self.baseline_mean, 3) if self.warmed_up else None,
+            "baseline_sigma": round(self.baseline_sigma, 3) if self.warmed_up else None,
+            "cusum": round(self.cusum, 3),
+            "level": self.level,
+        }
+
+    def summary(self):
+        """Returns sample count, mean, standard deviation, min and max since the last reset."""
+        if not self.samples:
+            return {"samples": 0, "mean": None, "std": None, "min": None, "max": None}
+        variance = self._m2 / (self.samples - 1) if self.samples > 1 else 0.0
+        return {
+            "samples": self.samples,
+            "mean": round(self._mean, 3),
+            "std": round(math.sqrt(variance), 3),
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+
+
+class ClutchAnomalyDetector:
+    """
+    Per-cycle anomaly detector for the one-way clutch test.
+
+    Tracks forward RPM, reverse-phase RPM and motor temperature. A negative
+    reverse-phase RPM is treated as an immediate clutch slip (critical);
+    slower RPM drifts are graded through each channel's CUSUM, and motor
+    temperature against absolute limits. Wear is reported when either RPM
+    channel reaches the critical level. The worst level since the last reset
+    is latched so a single-cycle slip is not lost.
+    """
+
+    WEAR_CHANNELS = ("forward_rpm", "reverse_rpm")
+
+    def __init__(self, slip_rpm_threshold=0, warmup_cycles=50, temp_warning=80, temp_critical=90,
+                 status_file=STATUS_FILE):
+        self.slip_rpm_threshold = slip_rpm_threshold
+        self.status_file = status_file
+        self.channels = {
+            "forward_rpm": ChannelMonitor("forward_rpm", direction=-1, warmup_cycles=warmup_cycles,
+                                          min_sigma=2.0),
+            "reverse_rpm": ChannelMonitor("reverse_rpm", direction=-1, warmup_cycles=warmup_cycles,
+                                          min_sigma=2.0),
+            "motor_temp": ChannelMonitor("motor_temp", direction=1, warning_limit=temp_warning,
+                                         critical_limit=temp_critical),
+        }
+        self.reset()
+
+    def reset(self):
+        """Starts a fresh baseline, e.g. at the beginning of a new test."""
+        for channel in self.channels.values():
+            channel.reset()
+        self.cycle = None
+        self.level = LEVEL_NORMAL
+        self.message = "No anomalies detected"
+        self.slip_detected = False
+        self.worst_level = LEVEL_NORMAL
+        self.worst_message = self.message
+        self.first_slip_cycle = None
+        self.wear_seen = False
+
+    @property
+    def wear_detected(self):
+        return self.slip_detected or any(
+            self.channels[name].level == LEVEL_CRITICAL for name in self.WEAR_CHANNELS
+        )
+
+    def update(self, cycle, forward_rpm=None, reverse_rpm=None, motor_temp=None):
+        """Feeds one completed cycle's readings and returns the overall alarm level."""
+        self.cycle = cycle
+        self.slip_detected = reverse_rpm is not None and reverse_rpm < self.slip_rpm_threshold
+
+        # Slip readings are graded by the slip rule and kept out of the running statistics
+        readings = {
+            "forward_rpm": forward_rpm,
+            "reverse_rpm": None if self.slip_detected else reverse_rpm,
+            "motor_temp": motor_temp,
+        }
+        for name, value in readings.items():
+            if value is not None:
+                self.channels[name].update(value)
+
+        previous_level = self.level
+        if self.slip_detected:
+            self.level = LEVEL_CRITICAL
+            self.message = f"Clutch slip: reverse RPM {reverse_rpm} at cycle {cycle}"
+            if self.first_slip_cycle is None:
+                self.first_slip_cycle = cycle
+        else:
+            worst = max(self.channels.values(), key=lambda c: _LEVEL_RANK[c.level])
+            self.level = worst.level
+            if self.level == LEVEL_NORMAL:
+                self.message = "No anomalies detected"
+            elif worst.warning_limit is not None or worst.critical_limit is not None:
+                self.message = (f"{worst.name.replace('_', ' ').capitalize()} "
+                                f"{worst.last_value} above limit at cycle {cycle}")
+            else:
+                self.message = (f"{worst.name.replace('_', ' ').capitalize()} drift "
+                                f"(CUSUM {worst.cusum:.1f}) at cycle {cycle}")
+
+        if _LEVEL_RANK[self.level] > _LEVEL_RANK[self.worst_level]:
+            self.worst_level = self.level
+            self.worst_message = self.message
+        if self.wear_detected:
+            self.wear_seen = True
+
+        if self.level != previous_level:
+            if self.level == LEVEL_NORMAL:
+                logging.info(f"Anomaly cleared at cycle {cycle}")
+            else:
+                logging.warning(f"Anomaly {self.level}: {self.message}")
+
+        self.write_status()
+        return self.level
+
+    def status(self):
+        return {
+            "cycle": self.cycle,
+            "level": self.level,
+            "message": self.message,
+            "worst_level": self.worst_level,
+            "worst_message": self.worst_message,
+            "first_slip_cycle": self.first_slip_cycle,
+            "wear_detected": self.wear_seen,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "channels": {name: channel.snapshot() for name, channel in self.channels.items()},
+        }
+
+    def summary(self):
+        return {name: channel.summary() for name, channel in self.channels.items()}
+
+    def write_status(self):
+        """Writes the current status so the Flask API can report it."""
+        if not self.status_file:
+            return
+        try:
+            tmp_file = f"{self.status_file}.tmp"
+            with open(tmp_file, "w") as file:
+                json.dump(self.status(), file)
+            os.replace(tmp_file, self.status_file)
+        except Exception as e:
+            logging.error(f"Error writing anomaly status: {e}")
+
+
+def load_status(file_name=STATUS_FILE):
+    """Reads the last anomaly status written by a running test."""
+    if not os.path.exists(file_name):
+        return None
+    with open(file_name, "r") as file:
+        return json.load(file)
@@ -1,8 +1,10 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from PIL import Image, ImageTk
 import threading
 from motor_controller import MotorController
+from clutch_monitor import LEVEL_CRITICAL, LEVEL_NORMAL
+from batch_runner import BatchRunner, load_test_matrix, write_report
 
 
 class OneWayClutchTesterGUI:
@@ -27,6 +29,7 @@ class OneWayClutchTesterGUI:
         """Initialize all GUI variables"""
         self.target_cycles = tk.StringVar(value="-1")
         self.running = False
+        self.batch_runner = None
         self.current_cycle = tk.StringVar(value="0")
         self.motor_rpm = tk.StringVar(value="0")
         self.motor_torque = tk.StringVar(value="0")
@@ -44,6 +47,7 @@ class OneWayClutchTesterGUI:
         self.reverse_duration = tk.StringVar(value="3")
         self.max_motor_current = tk.StringVar(value="100")
         self.max_brake_current = tk.StringVar(value="100")
+        self.auto_stop_on_wear = tk.BooleanVar(value=True)
 
     def create_gui(self):
         main_container = tk.Frame(self.root)
@@ -123,6 +127,9 @@ class OneWayClutchTesterGUI:
             padx=5)
         tk.Entry(cycles_frame, textvariable=self.current_cycle, state="readonly", width=10).pack(side="left")
 
+        tk.Checkbutton(cycles_frame, text="Auto-stop on clutch wear", variable=self.auto_stop_on_wear).pack(
+            side="left", padx=10)
+
         # Control Buttons
         button_frame = tk.Frame(main_container)
         button_frame.pack(pady=10)
@@ -133,6 +140,9 @@ class OneWayClutchTesterGUI:
         self.stop_button = tk.Button(button_frame, text="Stop", command=self.stop_test, width=15)
         self.stop_button.pack(side="left", padx=10)
 
+        self.batch_button = tk.Button(button_frame, text="Run Batch...", command=self.start_batch, width=15)
+        self.batch_button.pack(side="left", padx=10)
+
         # Status Frame
         status_frame = tk.Frame(main_container)
         status_frame.pack(fill="x", pady=5)
@@ -248,7 +258,8 @@ class OneWayClutchTesterGUI:
                     "forward_duration": float(self.forward_duration.get()),
                     "reverse_duration": float(self.reverse_duration.get()),
                     "max_motor_current": float(self.max_motor_current.get()),
-                    "max_brake_current": float(self.max_brake_current.get())
+                    "max_brake_current": float(self.max_brake_current.get()),
+                    "auto_stop_on_wear": self.auto_stop_on_wear.get()
                 }
 
                 self.running = True
@@ -274,6 +285,9 @@ class OneWayClutchTesterGUI:
         """Runs the test and monitors for completion"""
         try:
             final_cycle = self.motor_controller.start_test(params, target_cycles)
+            if self.motor_controller.wear_stop or self.motor_controller.anomaly_detector.wear_seen:
+                self.root.after(0, self.handle_test_completion, "wear")
+                return
             # If we reach here, test completed successfully
             self.root.after(0, self.handle_test_completion, "completed")
         except Exception as e:
@@ -283,23 +297,99 @@ class OneWayClutchTesterGUI:
     def handle_test_completion(self, status):
         """Handles test completion and updates UI accordingly"""
         self.running = False
+        self.batch_runner = None
         self.start_button.config(state="normal")
+        self.batch_button.config(state="normal")
 
         if status == "completed":
             self.update_status_lights("completed")
             self.status_message.set("Test Completed Successfully")
             messagebox.showinfo("Success", "Target cycles completed successfully!")
+        elif status == "wear":
+            self.update_status_lights("stopped")
+            message = self.motor_controller.anomaly_detector.worst_message
+            if self.motor_controller.wear_stop:
+                self.status_message.set(f"Test Stopped: {message}")
+            else:
+                self.status_message.set(f"Test Finished With Clutch Wear: {message}")
+            messagebox.showwarning("Clutch Wear Detected", message)
         else:
             self.update_status_lights("stopped")
             self.status_message.set("Test Stopped Due to Error")
 
+    def start_batch(self):
+        """Handles the run batch button click"""
+        if self.running or not self.motor_controller:
+            return
+        matrix_file = filedialog.askopenfilename(
+            title="Select Test Matrix",
+            filetypes=[("Test matrix", "*.csv *.ods"), ("All files", "*.*")]
+        )
+        if not matrix_file:
+            return
+        try:
+            cases = load_test_matrix(matrix_file, {"auto_stop_on_wear": self.auto_stop_on_wear.get()})
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load test matrix: {str(e)}")
+            return
+        report_file = filedialog.asksaveasfilename(
+            title="Save Batch Report",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("ODS", "*.ods")]
+        )
+        if not report_file:
+            return
+
+        self.running = True
+        self.batch_runner = BatchRunner(self.motor_controller, stop_on_wear=self.auto_stop_on_wear.get())
+        self.update_status_lights("running")
+        self.start_button.config(state="disabled")
+        self.batch_button.config(state="disabled")
+
+        self.test_thread = threading.Thread(
+            target=self.run_batch_with_monitoring,
+            args=(cases, report_file)
+        )
+        self.test_thread.daemon = True
+        self.test_thread.start()
+
+    def run_batch_with_monitoring(self, cases, report_file):
+        """Runs the batch and writes the report when it finishes"""
+        try:
+            results = self.batch_runner.run(cases)
+            summary = write_report(report_file, results)
+            self.root.after(0, self.handle_batch_completion, summary, report_file)
+        except Exception as e:
+            self.root.after(0, self.handle_test_completion, "error")
+
+    def handle_batch_completion(self, summary, report_file):
+        """Handles batch completion and updates UI accordingly"""
+        self.running = False
+        self.batch_runner = None
+        self.start_button.config(state="normal")
+        self.batch_button.config(state="normal")
+
+        message = (f"{summary['cases_completed']} of {summary['cases_total']} cases completed, "
+                   f"{summary['total_cycles']} cycles")
+        if summary["wear_detected"]:
+            self.update_status_lights("stopped")
+            self.status_message.set(f"Batch Finished: Clutch Wear Detected ({message})")
+        else:
+            self.update_status_lights("completed")
+            self.status_message.set(f"Batch Finished: {message}")
+        messagebox.showinfo("Batch Finished", f"{message}\nReport saved to {report_file}")
+
     def stop_test(self):
         """Handles the stop button click"""
         self.running = False
         self.update_status_lights("stopped")
-        self.start_button.config(state="normal")
         try:
-            self.motor_controller.stop_test()
+            if self.batch_runner:
+                # Buttons stay disabled until the batch thread finishes in handle_batch_completion
+                self.batch_runner.stop()
+            else:
+                self.start_button.config(state="normal")
+                self.motor_controller.stop_test()
         except Exception as e:
             messagebox.showerror("Error", f"Error stopping test: {str(e)}")
 
@@ -317,8 +407,12 @@ class OneWayClutchTesterGUI:
                 current_count = self.motor_controller.get_last_cycle_count("No_of_cycles.txt")
                 self.current_cycle.set(str(current_count))
 
-                # Check warning conditions
-                if float(self.motor_temp.get()) > 80:
+                # Check warning conditions, clutch anomalies first
+                anomaly = self.motor_controller.anomaly_detector
+                if anomaly.worst_level != LEVEL_NORMAL:
+                    self.update_status_lights("stopped" if anomaly.worst_level == LEVEL_CRITICAL else "warning")
+                    self.status_message.set(f"{anomaly.worst_level.capitalize()}: {anomaly.worst_message}")
+                elif float(self.motor_temp.get()) > 80:
                     self.update_status_lights("warning")
                 elif float(self.battery_soc.get()) < 30:
                     self.update_status_lights("warning")
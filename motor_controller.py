@@ -3,6 +3,7 @@ import serial
 import logging
 import os
 import time
+from clutch_monitor import ClutchAnomalyDetector, LEVEL_CRITICAL
 
 logging.basicConfig(
     filename="Log_no_of_cycles.log",
@@ -19,6 +20,9 @@ class MotorController:
         self.slave_address = slave_address
         self.baudrate = baudrate
         self.running = False
+        self.auto_stop_on_wear = True
+        self.wear_stop = False
+        self.anomaly_detector = ClutchAnomalyDetector()
         self.setup_motor()
 
     def setup_motor(self):
@@ -71,7 +75,7 @@ class MotorController:
             "controller_temp": {"address": 259, "multiplier": 1},
             "battery_voltage": {"address": 265, "multiplier": 0.03},
             "battery_state of charge": {"address": 267, "multiplier": 1},
-            "motor_rpm": {"address": 263, "multiplier": 1},
+            "motor_rpm": {"address": 263, "multiplier": 1, "signed": True},
         }
 
         config = parameter_config.get(data_type)
@@ -79,7 +83,7 @@ class MotorController:
             logging.error(f"Invalid data type requested: {data_type}")
             return None
         try:
-            raw_value = self.motor.read_register(config["address"], 0)
+            raw_value = self.motor.read_register(config["address"], 0, signed=config.get("signed", False))
             scaled_value = raw_value * config["multiplier"]
             return scaled_value
         except Exception as e:
@@ -87,9 +91,9 @@ class MotorController:
             return None
 
     def get_last_cycle_count(self, file_name):
-        """Reads the last recorded cycle count from the file."""
+        """Reads the last recorded cycle count from the file, or 0 if none is recorded."""
         if not os.path.exists(file_name):
-            return 1
+            return 0
         try:
             with open(file_name, "r") as file:
                 lines = file.readlines()
@@ -101,7 +105,7 @@ class MotorController:
                             continue
         except Exception as e:
             logging.error(f"Error reading cycle count: {e}")
-            return 1
+        return 0
 
     def calculate_battery_soc(self, battery_voltage):
         """
@@ -123,7 +127,7 @@ class MotorController:
                 self.execute_command("set_remote_torque_command", torque)
                 time.sleep(duration)
                 motor_rpm = self.read_motor_data("motor_rpm")
-                if motor_rpm < 0:
+                if motor_rpm is not None and motor_rpm < self.anomaly_detector.slip_rpm_threshold:
                     logging.warning("One-way clutch might be worn out. Negative RPM detected.")
                     return False
         return True
@@ -152,8 +156,8 @@ class MotorController:
     def perform_motor_cycles(self, torque_duration_pairs, cycle_count_target, txt_file_name):
         """Performs motorcycles and logs the data."""
         try:
-            # Get current cycle count
-            current_count = self.get_last_cycle_count(txt_file_name) or 1
+            # Resume after the last recorded cycle
+            current_count = self.get_last_cycle_count(txt_file_name) + 1
 
             # Calculate target count
             if cycle_count_target == -1:
@@ -222,7 +226,7 @@ class MotorController:
                                         forward_torque = motor_rpm
                                     elif torque == 0:
                                         reverse_torque = motor_rpm
-                                    elif torque < -1:
+                                    elif torque < 0:
                                         negative_torque = motor_rpm
                                 break
                             except (minimalmodbus.InvalidResponseError, serial.SerialTimeoutException):
@@ -244,6 +248,18 @@ class MotorController:
                             time.sleep(1)
                             retry_count += 1
 
+                    # Streaming anomaly detection on this cycle's readings
+                    level = self.anomaly_detector.update(
+                        current_count,
+                        forward_rpm=forward_torque,
+                        reverse_rpm=negative_torque,
+                        motor_temp=motor_temp,
+                    )
+                    if level == LEVEL_CRITICAL and self.auto_stop_on_wear and self.anomaly_detector.wear_detected:
+                        logging.warning(f"Stopping test: {self.anomaly_detector.message}")
+                        self.wear_stop = True
+                        self.running = False
+
                     # Log cycle data
                     cycle_data = (
                         f"No of cycles: {current_count}\n"
@@ -291,24 +307,31 @@ class MotorController:
 
         return current_count
 
+    def configure_test(self, params):
+        """Writes the test parameters to the controller and returns the torque-duration pairs."""
+        self.running = True
+        self.wear_stop = False
+        self.auto_stop_on_wear = params.get("auto_stop_on_wear", True)
+        self.anomaly_detector.reset()
+        self.execute_command("set_speed_regulator_mode", 2)
+        self.execute_command("set_remote_torque_command", params["forward_torque"])
+        self.execute_command("set_remote_maximum_regen_battery_current_limit", 41)
+        self.execute_command("set_remote_maximum_battery_current_limit", 70)
+        self.execute_command("set_remote_maximum_motoring_current", params["max_motor_current"])
+        self.execute_command("set_remote_maximum_braking_current", params["max_brake_current"])
+        self.execute_command("set_remote_maximum_braking_torque", abs(params["reverse_torque"]))
+        self.execute_command("set_remote_speed_command", params["target_rpm"])
+        self.execute_command("set_remote_state_command", 2)
+
+        return [
+            (params["forward_torque"], params["forward_duration"]),
+            (params["reverse_torque"], params["reverse_duration"])
+        ]
+
     def start_test(self, params, cycle_count_target=-1):
         """Starts the motor test with the given parameters."""
         try:
-            self.running = True
-            self.execute_command("set_speed_regulator_mode", 2)
-            self.execute_command("set_remote_torque_command", params["forward_torque"])
-            self.execute_command("set_remote_maximum_regen_battery_current_limit", 41)
-            self.execute_command("set_remote_maximum_battery_current_limit", 70)
-            self.execute_command("set_remote_maximum_motoring_current", params["max_motor_current"])
-            self.execute_command("set_remote_maximum_braking_current", params["max_brake_current"])
-            self.execute_command("set_remote_maximum_braking_torque", abs(params["reverse_torque"]))
-            self.execute_command("set_remote_speed_command", params["target_rpm"])
-            self.execute_command("set_remote_state_command", 2)
-
-            torque_duration_pairs = [
-                (params["forward_torque"], params["forward_duration"]),
-                (params["reverse_torque"], params["reverse_duration"])
-            ]
+            torque_duration_pairs = self.configure_test(params)
             return self.perform_motor_cycles(torque_duration_pairs, cycle_count_target, "No_of_cycles.txt")
         except Exception as e:
             logging.error(f"Error starting test: {e}")
@@ -1,7 +1,8 @@
-from flask import Flask
+from flask import Flask, jsonify
 import subprocess
 import os
 import platform
+from clutch_monitor import STATUS_FILE, load_status
 
 app = Flask(__name__)
 
@@ -30,5 +31,16 @@ def start_gui():
     except Exception as e:
         return f"Error: {str(e)}", 500
 
+@app.route('/anomaly_status', methods=['GET'])
+def anomaly_status():
+    try:
+        status = load_status(STATUS_FILE)
+        if status is None:
+            return jsonify({"level": "normal", "message": "No test data available"}), 200
+        return jsonify(status), 200
+
+    except Exception as e:
+        return f"Error: {str(e)}", 500
+
 if __name__ == '__main__':
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,220 @@
+import csv
+
+import pytest
+
+from batch_runner import BatchRunner, DEFAULT_PARAMS, load_test_matrix, summarize_results, write_report
+from clutch_monitor import ClutchAnomalyDetector, LEVEL_CRITICAL
+
+
+def _write_matrix(tmp_path, rows):
+    matrix_file = tmp_path / "matrix.csv"
+    with open(matrix_file, "w", newline="") as file:
+        csv.writer(file).writerows(rows)
+    return str(matrix_file)
+
+
+class FakeController:
+    """Stands in for MotorController, logging cycles the way perform_motor_cycles does."""
+
+    def __init__(self, slip_cycles=()):
+        self.anomaly_detector = ClutchAnomalyDetector(status_file=None, warmup_cycles=5)
+        self.slip_cycles = set(slip_cycles)
+        self.last_cycle = 0
+        self.wear_stop = False
+        self.auto_stop_on_wear = False
+        self.configured = []
+
+    def get_last_cycle_count(self, file_name):
+        return self.last_cycle
+
+    def configure_test(self, params):
+        self.configured.append(params)
+        self.wear_stop = False
+        self.auto_stop_on_wear = params.get("auto_stop_on_wear", False)
+        self.anomaly_detector.reset()
+        return [(params["forward_torque"], 0), (params["reverse_torque"], 0)]
+
+    def perform_motor_cycles(self, torque_duration_pairs, cycle_count_target, txt_file_name):
+        current_count = self.last_cycle + 1
+        target_count = current_count + cycle_count_target
+        while current_count < target_count:
+            reverse_rpm = -5 if current_count in self.slip_cycles else 300
+            self.anomaly_detector.update(current_count, forward_rpm=380, reverse_rpm=reverse_rpm, motor_temp=40)
+            self.last_cycle = current_count
+            current_count += 1
+            if self.auto_stop_on_wear and self.anomaly_detector.wear_detected:
+                self.wear_stop = True
+                break
+        return current_count
+
+    def stop_test(self):
+        pass
+
+
+def test_load_matrix_expands_combinations(tmp_path):
+    matrix_file = _write_matrix(tmp_path, [
+        ["case_id", "target_rpm", "forward_torque", "cycles"],
+        ["sweep", "250;320", "80;100", "10"],
+        ["single", "", "", "5"],
+    ])
+    cases = load_test_matrix(matrix_file)
+    assert [case["case_id"] for case in cases] == ["sweep.1", "sweep.2", "sweep.3", "sweep.4", "single"]
+    assert [(case["target_rpm"], case["forward_torque"]) for case in cases[:4]] == [
+        (250, 80), (250, 100), (320, 80), (320, 100)]
+    assert cases[4]["target_rpm"] == DEFAULT_PARAMS["target_rpm"]
+    assert cases[4]["cycles"] == 5
+
+
+def test_load_matrix_defaults_override(tmp_path):
+    matrix_file = _write_matrix(tmp_path, [
+        ["case_id", "cycles", "auto_stop_on_wear"],
+        ["a", "10", ""],
+        ["b", "10", "true"],
+    ])
+    cases = load_test_matrix(matrix_file, {"auto_stop_on_wear": False})
+    assert [case["auto_stop_on_wear"] for case in cases] == [False, True]
+    assert load_test_matrix(matrix_file)[0]["auto_stop_on_wear"] is True
+
+
+def test_load_matrix_rejects_unknown_column(tmp_path):
+    matrix_file = _write_matrix(tmp_path, [["case_id", "forward_torgue", "cycles"], ["a", "60", "10"]])
+    with pytest.raises(ValueError, match="forward_torgue"):
+        load_test_matrix(matrix_file)
+
+
+@pytest.mark.parametrize("rows, message", [
+    ([["case_id", "target_rpm"], ["a", "320"]], "cycles"),
+    ([["case_id", "cycles"], ["a", "0"]], "positive"),
+    ([["case_id", "target_rpm", "cycles"], ["a", "fast", "10"]], "fast"),
+    ([], "empty"),
+])
+def test_load_matrix_rejects_bad_input(tmp_path, rows, message):
+    with pytest.raises(ValueError, match=message):
+        load_test_matrix(_write_matrix(tmp_path, rows))
+
+
+def test_batch_reports_non_overlapping_cycle_ranges(tmp_path):
+    controller = FakeController()
+    controller.last_cycle = 29
+    cases = load_test_matrix(_write_matrix(tmp_path, [["case_id", "cycles"], ["a", "30"], ["b", "30"]]))
+    results = BatchRunner(controller, cycle_file=None).run(cases)
+    assert [(r["start_cycle"], r["end_cycle"], r["cycles_completed"]) for r in results] == [
+        (30, 59, 30), (60, 89, 30)]
+    assert all(r["status"] == "completed" for r in results)
+
+
+def test_slip_without_auto_stop_is_reported(tmp_path):
+    controller = FakeController(slip_cycles={10})
+    cases = load_test_matrix(
+        _write_matrix(tmp_path, [["case_id", "cycles"], ["a", "30"], ["b", "30"]]),
+        {"auto_stop_on_wear": False},
+    )
+    results = BatchRunner(controller, cycle_file=None, stop_on_wear=False).run(cases)
+
+    assert results[0]["status"] == "completed"
+    assert results[0]["anomaly_level"] == LEVEL_CRITICAL
+    assert results[0]["first_slip_cycle"] == 10
+    assert results[0]["wear_detected"] is True
+    assert results[1]["wear_detected"] is False
+    assert summarize_results(results)["wear_detected"] is True
+
+
+def test_wear_aborts_remaining_cases(tmp_path):
+    controller = FakeController(slip_cycles={10})
+    cases = load_test_matrix(_write_matrix(tmp_path, [["case_id", "cycles"], ["a", "30"], ["b", "30"]]))
+    results = BatchRunner(controller, cycle_file=None).run(cases)
+
+    assert results[0]["status"] == "wear_stop"
+    assert results[0]["end_cycle"] == 10
+    assert results[1]["status"] == "skipped (stopped)"
+    assert len(controller.configured) == 1
+    summary = summarize_results(results)
+    assert (summary["cases_completed"], summary["cases_failed"], summary["cases_skipped"]) == (0, 1, 1)
+
+
+def test_write_csv_report(tmp_path):
+    controller = FakeController()
+    cases = load_test_matrix(_write_matrix(tmp_path, [["case_id", "cycles"], ["a", "20"]]))
+    results = BatchRunner(controller, cycle_file=None).run(cases)
+    report_file = tmp_path / "report.csv"
+    summary = write_report(str(report_file), results)
+
+    with open(report_file, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert rows[0]["case_id"] == "a"
+    assert rows[0]["forward_rpm_mean"] == "380.0"
+    assert summary["total_cycles"] == 20
+    assert (tmp_path / "report_summary.csv").exists()
+
+
+def test_load_ods_matrix_round_trip(tmp_path):
+    pytest.importorskip("odf")
+    from odf.opendocument import OpenDocumentSpreadsheet
+    from odf.table import Table, TableRow, TableCell
+    from odf.text import P
+
+    def cell(text, **attributes):
+        table_cell = TableCell(**attributes)
+        table_cell.addElement(P(text=text))
+        return table_cell
+
+    table = Table(name="Matrix")
+    header = TableRow()
+    for column in ("case_id", "target_rpm", "forward_duration", "cycles"):
+        header.addElement(cell(column, valuetype="string"))
+    header.addElement(TableCell(numbercolumnsrepeated=1000))
+    table.addElement(header)
+    # LibreOffice collapses identical rows into one with number-rows-repeated
+    repeated = TableRow(numberrowsrepeated=3)
+    repeated.addElement(cell("dup", valuetype="string"))
+    repeated.addElement(cell("320", valuetype="float", value=320))
+    repeated.addElement(cell("2,5", valuetype="float", value=2.5))
+    repeated.addElement(cell("1,000", valuetype="float", value=1000))
+    repeated.addElement(TableCell(numbercolumnsrepeated=1000))
+    table.addElement(repeated)
+    blank = TableRow(numberrowsrepeated=1048570)
+    blank.addElement(TableCell(numbercolumnsrepeated=1024))
+    table.addElement(blank)
+    document = OpenDocumentSpreadsheet()
+    document.spreadsheet.addElement(table)
+    matrix_file = str(tmp_path / "matrix.ods")
+    document.save(matrix_file)
+
+    cases = load_test_matrix(matrix_file)
+    assert len(cases) == 3
+    assert all((case["target_rpm"], case["forward_duration"], case["cycles"]) == (320, 2.5, 1000)
+               for case in cases)
+
+
+def test_write_ods_report(tmp_path):
+    pytest.importorskip("odf")
+    from odf.opendocument import load
+    from odf.table import Table
+
+    cases = load_test_matrix(_write_matrix(tmp_path, [["case_id", "cycles"], ["a", "20"]]))
+    results = BatchRunner(FakeController(), cycle_file=None).run(cases)
+    report_file = str(tmp_path / "report.ods")
+    write_report(report_file, results)
+    names = [table.getAttribute("name") for table in load(report_file).spreadsheet.getElementsByType(Table)]
+    assert names == ["Results", "Summary"]
+
+
+class InterruptingController(FakeController):
+    """Logs a few cycles of case `b`, then gets Ctrl-C."""
+
+    def perform_motor_cycles(self, torque_duration_pairs, cycle_count_target, txt_file_name):
+        if self.configured[-1]["case_id"] != "b":
+            return super().perform_motor_cycles(torque_duration_pairs, cycle_count_target, txt_file_name)
+        self.last_cycle += 7
+        raise KeyboardInterrupt
+
+
+def test_interrupt_records_partial_case(tmp_path):
+    cases = load_test_matrix(_write_matrix(tmp_path, [["case_id", "cycles"], ["a", "5"], ["b", "30"], ["c", "5"]]))
+    runner = BatchRunner(InterruptingController(), cycle_file=None)
+    with pytest.raises(KeyboardInterrupt):
+        runner.run(cases)
+
+    assert [r["status"] for r in runner.results] == ["completed", "stopped", "skipped (stopped)"]
+    assert (runner.results[1]["start_cycle"], runner.results[1]["end_cycle"]) == (6, 12)
+    assert runner.results[1]["cycles_completed"] == 7
@@ -0,0 +1,140 @@
+import json
+
+from clutch_monitor import (
+    ChannelMonitor,
+    ClutchAnomalyDetector,
+    LEVEL_CRITICAL,
+    LEVEL_NORMAL,
+    LEVEL_WARNING,
+    load_status,
+)
+
+
+def _detector(**kwargs):
+    return ClutchAnomalyDetector(status_file=None, warmup_cycles=10, **kwargs)
+
+
+def _warm_up(detector, cycles=10):
+    for cycle in range(1, cycles + 1):
+        detector.update(cycle, forward_rpm=380, reverse_rpm=300, motor_temp=40)
+
+
+def test_stable_readings_stay_normal():
+    detector = _detector()
+    for cycle in range(1, 500):
+        assert detector.update(cycle, forward_rpm=380, reverse_rpm=300, motor_temp=40) == LEVEL_NORMAL
+    assert detector.worst_level == LEVEL_NORMAL
+    assert not detector.wear_seen
+
+
+def test_negative_reverse_rpm_is_critical_slip():
+    detector = _detector()
+    _warm_up(detector)
+    assert detector.update(11, forward_rpm=380, reverse_rpm=-5, motor_temp=40) == LEVEL_CRITICAL
+    assert detector.wear_detected
+    assert "slip" in detector.message.lower()
+
+
+def test_slip_is_latched_after_recovery():
+    detector = _detector()
+    _warm_up(detector)
+    detector.update(11, forward_rpm=380, reverse_rpm=-5, motor_temp=40)
+    detector.update(12, forward_rpm=380, reverse_rpm=300, motor_temp=40)
+    detector.update(13, forward_rpm=380, reverse_rpm=-3, motor_temp=40)
+
+    assert detector.level == LEVEL_CRITICAL
+    detector.update(14, forward_rpm=380, reverse_rpm=300, motor_temp=40)
+    assert detector.level == LEVEL_NORMAL
+    status = detector.status()
+    assert status["worst_level"] == LEVEL_CRITICAL
+    assert status["first_slip_cycle"] == 11
+    assert status["wear_detected"] is True
+    assert "cycle 11" in status["worst_message"]
+
+
+def test_reset_clears_latch():
+    detector = _detector()
+    _warm_up(detector)
+    detector.update(11, reverse_rpm=-5)
+    detector.reset()
+    assert detector.worst_level == LEVEL_NORMAL
+    assert detector.first_slip_cycle is None
+    assert not detector.wear_seen
+
+
+def test_cusum_grades_warning_then_critical():
+    channel = ChannelMonitor("rpm", direction=-1, warmup_cycles=5, min_sigma=1.0)
+    for _ in range(5):
+        channel.update(100)
+    # Each sample 3 sigma low adds 2 to the CUSUM (k = 1)
+    levels = [channel.update(97) for _ in range(6)]
+    assert levels[:2] == [LEVEL_NORMAL, LEVEL_NORMAL]
+    assert levels[2] == LEVEL_WARNING
+    assert levels[5] == LEVEL_CRITICAL
+
+
+def test_cusum_ignores_shift_in_other_direction():
+    channel = ChannelMonitor("rpm", direction=-1, warmup_cycles=5, min_sigma=1.0)
+    for _ in range(5):
+        channel.update(100)
+    for _ in range(50):
+        assert channel.update(120) == LEVEL_NORMAL
+    assert channel.cusum == 0.0
+
+
+def test_reverse_rpm_drift_is_wear():
+    detector = _detector()
+    _warm_up(detector)
+    for cycle in range(11, 30):
+        detector.update(cycle, forward_rpm=380, reverse_rpm=280, motor_temp=40)
+    assert detector.level == LEVEL_CRITICAL
+    assert detector.wear_detected
+
+
+def test_gradual_temperature_rise_is_not_an_alarm():
+    detector = _detector()
+    for cycle in range(1, 200):
+        detector.update(cycle, forward_rpm=380, reverse_rpm=300, motor_temp=30 + 0.2 * cycle)
+    assert detector.worst_level == LEVEL_NORMAL
+
+
+def test_temperature_graded_against_absolute_limits():
+    detector = _detector(temp_warning=80, temp_critical=90)
+    _warm_up(detector)
+    assert detector.update(11, forward_rpm=380, reverse_rpm=300, motor_temp=85) == LEVEL_WARNING
+    assert detector.update(12, forward_rpm=380, reverse_rpm=300, motor_temp=92) == LEVEL_CRITICAL
+    assert not detector.wear_detected
+
+
+def test_status_file_round_trip(tmp_path):
+    status_file = tmp_path / "status.json"
+    detector = ClutchAnomalyDetector(status_file=str(status_file), warmup_cycles=10)
+    detector.update(1, forward_rpm=380, reverse_rpm=-1, motor_temp=40)
+    status = load_status(str(status_file))
+    assert status["level"] == LEVEL_CRITICAL
+    assert status["first_slip_cycle"] == 1
+    assert json.loads(status_file.read_text())["wear_detected"] is True
+
+
+def test_load_status_missing_file(tmp_path):
+    assert load_status(str(tmp_path / "missing.json")) is None
+
+
+def test_summary_statistics():
+    channel = ChannelMonitor("rpm", direction=-1, warmup_cycles=2)
+    assert channel.summary()["samples"] == 0
+    for value in (1e6 + 4, 1e6 + 7, 1e6 + 13, 1e6 + 16):
+        channel.update(value)
+    summary = channel.summary()
+    assert summary["samples"] == 4
+    assert summary["mean"] == 1e6 + 10
+    assert summary["std"] == round(30 ** 0.5, 3)
+    assert (summary["min"], summary["max"]) == (1e6 + 4, 1e6 + 16)
+
+
+def test_default_status_file_is_next_to_module():
+    import os
+    import clutch_monitor
+
+    assert os.path.isabs(clutch_monitor.STATUS_FILE)
+    assert os.path.dirname(clutch_monitor.STATUS_FILE) == os.path.dirname(os.path.abspath(clutch_monitor.__file__))
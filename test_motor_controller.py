@@ -0,0 +1,129 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+from batch_runner import BatchRunner
+
+RPM_REGISTER = 263
+TORQUE_REGISTER = 494
+
+
+class FakeInstrument:
+    """Stands in for minimalmodbus.Instrument, answering reads from fixed values."""
+
+    slip_cycles = set()
+
+    def __init__(self, port, slave_address):
+        self.serial = types.SimpleNamespace()
+        self.registers = {261: 40, 259: 35, 265: 1600, 267: 90}
+        self.torque = 0
+        self.reverse_reads = 0
+
+    def write_registers(self, address, values):
+        if address == TORQUE_REGISTER:
+            self.torque = values[0]
+
+    def read_register(self, address, number_of_decimals=0, functioncode=3, signed=False):
+        if address == RPM_REGISTER:
+            # Negative torque is written as a two's-complement register value
+            if self.torque > 2 ** 15:
+                self.reverse_reads += 1
+                return -5 if self.reverse_reads in self.slip_cycles else 300
+            return 380
+        return self.registers[address]
+
+
+@pytest.fixture
+def motor_controller_module(monkeypatch, tmp_path):
+    minimalmodbus = types.ModuleType("minimalmodbus")
+    minimalmodbus.Instrument = FakeInstrument
+    minimalmodbus.InvalidResponseError = type("InvalidResponseError", (Exception,), {})
+    serial = types.ModuleType("serial")
+    serial.PARITY_NONE = "N"
+    serial.SerialTimeoutException = type("SerialTimeoutException", (Exception,), {})
+    monkeypatch.setitem(sys.modules, "minimalmodbus", minimalmodbus)
+    monkeypatch.setitem(sys.modules, "serial", serial)
+    monkeypatch.delitem(sys.modules, "motor_controller", raising=False)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(FakeInstrument, "slip_cycles", set())
+    module = importlib.import_module("motor_controller")
+    yield module
+    sys.modules.pop("motor_controller", None)
+
+
+@pytest.fixture
+def controller(motor_controller_module):
+    controller = motor_controller_module.MotorController()
+    controller.anomaly_detector.status_file = None
+    return controller
+
+
+def _params(**overrides):
+    params = {
+        "target_rpm": 320,
+        "forward_torque": 100,
+        "reverse_torque": -100,
+        "forward_duration": 0,
+        "reverse_duration": 0,
+        "max_motor_current": 100,
+        "max_brake_current": 100,
+    }
+    params.update(overrides)
+    return params
+
+
+def _logged_cycles(file_name="No_of_cycles.txt"):
+    with open(file_name) as file:
+        return [int(line.split(":")[1]) for line in file if line.startswith("No of cycles:")]
+
+
+def test_last_cycle_count_is_zero_without_records(controller, tmp_path):
+    assert controller.get_last_cycle_count(str(tmp_path / "missing.txt")) == 0
+    empty_file = tmp_path / "empty.txt"
+    empty_file.write_text("Set RPM: 320 RPM\n")
+    assert controller.get_last_cycle_count(str(empty_file)) == 0
+    empty_file.write_text("No of cycles: 41\nNo of cycles: 42\nSet RPM: 320 RPM\n")
+    assert controller.get_last_cycle_count(str(empty_file)) == 42
+
+
+def test_start_test_resumes_after_last_logged_cycle(controller):
+    assert controller.start_test(_params(), 3) == 4
+    assert controller.start_test(_params(), 2) == 6
+    assert _logged_cycles() == [1, 2, 3, 4, 5]
+
+
+def test_start_test_auto_stops_on_slip(controller):
+    FakeInstrument.slip_cycles = {4}
+    assert controller.start_test(_params(), 10) == 5
+    assert controller.wear_stop
+    assert controller.anomaly_detector.first_slip_cycle == 4
+    assert _logged_cycles() == [1, 2, 3, 4]
+
+    # A fresh run resumes numbering and clears the previous wear state
+    controller.motor.reverse_reads = 100
+    assert controller.start_test(_params(), 2) == 7
+    assert not controller.wear_stop
+    assert _logged_cycles() == [1, 2, 3, 4, 5, 6]
+
+
+def test_slip_without_auto_stop_is_latched(controller):
+    FakeInstrument.slip_cycles = {2}
+    assert controller.start_test(_params(auto_stop_on_wear=False), 5) == 6
+    assert not controller.wear_stop
+    assert controller.anomaly_detector.wear_seen
+
+
+def test_reverse_torque_of_minus_one_is_monitored(controller):
+    FakeInstrument.slip_cycles = {1}
+    controller.start_test(_params(reverse_torque=-1), 1)
+    assert controller.anomaly_detector.first_slip_cycle == 1
+
+
+def test_batch_runner_on_real_controller(controller):
+    cases = [dict(_params(), case_id="a", cycles=3), dict(_params(), case_id="b", cycles=2)]
+    results = BatchRunner(controller, cycle_file="No_of_cycles.txt").run(cases)
+    assert [(r["status"], r["start_cycle"], r["end_cycle"]) for r in results] == [
+        ("completed", 1, 3), ("completed", 4, 5)]
+    assert _logged_cycles() == [1, 2, 3, 4, 5]